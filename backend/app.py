@@ -7,6 +7,9 @@ os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 os.environ.setdefault("OMP_NUM_THREADS", "1")
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
+import asyncio
+import atexit
+import sys
 import time
 import threading
 from contextlib import asynccontextmanager
@@ -15,19 +18,27 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 
-from bible_search import parse_passages
+from counters import AtomicCounter
+from bible_search import close_batcher, parse_passages, load_caches as load_passage_caches
+from llm_cache import llm_cache
+from llm_client import close_client, warm_client
+from models import Verse
 from testimony_search import (
     search_testimonies_content,
     suggest_terms,
     analyze_query,
-    generate_derivatives,
+    generate_derivatives_batch,
     ensure_testimonies_file,
+    load_testimonies_data,
+    load_caches as load_testimony_caches,
+    start_scan_pool,
+    shutdown_scan_pool,
 )
 from categories import get_category_tree
 import elibrary
@@ -36,6 +47,14 @@ from pipeline import run_pipeline
 
 BACKEND_DIR = Path(__file__).resolve().parent
 
+# Hand log records to a background writer thread (enqueue=True) so stderr
+# writes never happen on the event loop; drain the queue on exit. Every
+# record carries its own timestamp, so messages don't need to format one.
+LOG_FORMAT = "{time:YYYY-MM-DDTHH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+logger.remove()
+logger.add(sys.stderr, level=os.environ.get("LOG_LEVEL", "INFO"), format=LOG_FORMAT, enqueue=True)
+atexit.register(logger.remove)
+
 # Shared eLibrary join map, built once at startup.
 JMAP: Optional[elibrary.JoinMap] = None
 
@@ -45,6 +64,10 @@ def _bg_prepare_testimonies():
     try:
         count = ensure_testimonies_file()
         logger.info(f"[BG] Testimonies file ready ({count} entries)")
+        # Parse both corpora now so the first search doesn't pay for it.
+        load_testimonies_data(1)
+        load_testimonies_data(2)
+        start_scan_pool()
     except Exception as e:
         logger.error(f"[BG] Failed to prepare testimonies: {e}")
 
@@ -63,12 +86,21 @@ async def lifespan(app: FastAPI):
     port = os.environ.get("PORT", "not set")
     logger.info(f"[STARTUP] PORT env var = {port}")
     threading.Thread(target=_bg_prepare_testimonies, daemon=True).start()
+    load_passage_caches()
+    load_testimony_caches()
+    # Handshake with OpenAI in the background so startup isn't blocked on the network.
+    warmup = asyncio.create_task(warm_client())
     # Load the FAISS index + BGE-M3 model in the background; semantic search
     # turns on when ready while keyword/filter work immediately.
     rag_search.load_in_background()
     logger.info("[STARTUP] Application ready (corpus + semantic index loading in background)")
     yield
     logger.info("[SHUTDOWN] Application shutting down")
+    warmup.cancel()
+    await close_batcher()
+    await close_client()
+    await asyncio.to_thread(shutdown_scan_pool)
+    llm_cache.close()
 
 
 class ElibrarySearchRequest(BaseModel):
@@ -78,87 +110,126 @@ class ElibrarySearchRequest(BaseModel):
     size: int = 20
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Simple in-memory analytics (in production, use a database)
-request_count = 0
-search_count = 0
+request_counter = AtomicCounter()
+search_counter = AtomicCounter()
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://marko-polo-cheno.github.io",
-        "https://almondsandolives.ca",
-        "https://www.almondsandolives.ca",
-        "http://localhost:3000",
-        "http://localhost:5199",
-        "http://localhost:5173",
-        "http://localhost:5174",
-        "http://localhost:5175",
-    ],
+    # Compiled once by Starlette and checked with a single fullmatch.
+    allow_origin_regex=(
+        r"https://marko-polo-cheno\.github\.io"
+        r"|https://(www\.)?almondsandolives\.ca"
+        r"|http://localhost:(3000|5199|5173|5174|5175)"
+    ),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    global request_count
-    start_time = time.time()
-    timestamp = datetime.now().isoformat()
+class RequestLoggingMiddleware:
+    """Pure ASGI request/response logger.
 
-    request_count += 1
+    Avoids ``@app.middleware("http")``, which wraps the handler in Starlette's
+    ``BaseHTTPMiddleware`` and allocates a Request/Response pair plus a task
+    group per hit. Headers are read straight off the ASGI scope.
+    """
 
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
-    referer = request.headers.get("referer", "direct")
-    origin = request.headers.get("origin", "unknown")
-    x_forwarded_for = request.headers.get("x-forwarded-for", "")
-    x_real_ip = request.headers.get("x-real-ip", "")
+    def __init__(self, app):
+        self.app = app
+
+    # The health check is hit constantly by liveness probes; pass it through.
+    QUIET_PATHS = frozenset({"/"})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.QUIET_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        req_no = request_counter.next()
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        user_agent = headers.get("user-agent", "unknown")
+        referer = headers.get("referer", "direct")
+        origin = headers.get("origin", "unknown")
+        x_forwarded_for = headers.get("x-forwarded-for", "")
+        x_real_ip = headers.get("x-real-ip", "")
+
+        real_ip = x_real_ip or (x_forwarded_for.split(",")[0].strip() if x_forwarded_for else client_ip)
+
+        url = scope["path"]
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+
+        logger.info(
+            "INCOMING REQUEST #{req_id} {method} {url} | ip={client_ip} "
+            "(original: {original_ip}) origin={origin} referer={referer} "
+            "ua={user_agent} xff={x_forwarded_for}",
+            req_id=req_no,
+            method=scope["method"],
+            url=url,
+            client_ip=real_ip,
+            original_ip=client_ip,
+            origin=origin,
+            referer=referer,
+            user_agent=user_agent,
+            x_forwarded_for=x_forwarded_for,
+        )
 
-    real_ip = x_real_ip or (x_forwarded_for.split(",")[0].strip() if x_forwarded_for else client_ip)
+        status_code = 500
 
-    logger.info(f"INCOMING REQUEST #{request_count} [{timestamp}]")
-    logger.info(f"   Method: {request.method}")
-    logger.info(f"   URL: {request.url}")
-    logger.info(f"   Client IP: {real_ip} (original: {client_ip})")
-    logger.info(f"   Origin: {origin}")
-    logger.info(f"   Referer: {referer}")
-    logger.info(f"   User-Agent: {user_agent}")
-    logger.info(f"   X-Forwarded-For: {x_forwarded_for}")
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-    response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                "RESPONSE #{req_id} status={status} in {ms:.1f}ms | "
+                "served to {client_ip} from {origin}",
+                req_id=req_no,
+                status=status_code,
+                ms=process_time * 1000,
+                client_ip=real_ip,
+                origin=origin,
+            )
 
-    process_time = time.time() - start_time
-    logger.info(f"RESPONSE #{request_count} [{timestamp}]")
-    logger.info(f"   Status: {response.status_code}")
-    logger.info(f"   Processing time: {process_time:.3f}s")
-    logger.info(f"   Served to: {real_ip} from {origin}")
 
-    return response
+app.add_middleware(RequestLoggingMiddleware)
 
 
 @app.get("/")
 async def health_check():
-    timestamp = datetime.now().isoformat()
-    logger.info(f"HEALTH CHECK [{timestamp}]")
-    return JSONResponse(content={"status": "ok"}, status_code=200)
+    logger.debug("HEALTH CHECK")
+    return ORJSONResponse(content={"status": "ok"}, status_code=200)
 
 
 @app.get("/analytics")
 async def get_analytics():
     """Simple analytics endpoint to track usage patterns."""
-    timestamp = datetime.now().isoformat()
-    logger.info(f"ANALYTICS REQUEST [{timestamp}]")
+    logger.info("ANALYTICS REQUEST")
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": "Analytics endpoint - check logs for detailed usage tracking",
-        "timestamp": timestamp,
+        "timestamp": datetime.now().isoformat(),
         "usage_stats": {
-            "total_requests": request_count,
-            "search_requests": search_count,
+            "total_requests": request_counter.value,
+            "search_requests": search_counter.value,
             "uptime": "Check logs for detailed timing and origin data",
+            # Counters live in each worker process; with WEB_CONCURRENCY > 1
+            # these are this worker's share only.
+            "worker_pid": os.getpid(),
         },
         "note": "All requests are logged with IP, origin, user-agent, and timing data",
     }, status_code=200)
@@ -171,132 +242,167 @@ async def search_endpoint(
     content_type: str = "verses",
     model_type: str = "fast",
 ):
-    global search_count
-
-    search_count += 1
+    search_no = search_counter.next()
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
 
-    logger.info(f"SEARCH REQUEST #{search_count} [{timestamp}]")
-    logger.info(f"   Query: '{query}'")
-    logger.info(f"   Params: result_count='{result_count}', content_type='{content_type}', model_type='{model_type}'")
+    logger.info(
+        "SEARCH REQUEST #{search_no} query={query!r} result_count={result_count} "
+        "content_type={content_type} model_type={model_type}",
+        search_no=search_no,
+        query=query,
+        result_count=result_count,
+        content_type=content_type,
+        model_type=model_type,
+    )
 
     try:
         if not query:
             logger.warning("Missing query parameter")
-            return JSONResponse(content={"error": "Missing query parameter"}, status_code=400)
+            return ORJSONResponse(content={"error": "Missing query parameter"}, status_code=400)
 
-        logger.info("Calling OpenAI API...")
-        result = parse_passages(query, result_count, content_type, model_type)
+        logger.debug("Calling OpenAI API...")
+        result = await parse_passages(query, result_count, content_type, model_type)
 
-        response = {
-            "passages": [p.model_dump() for p in result.passages],
-            "secondary_passages": [p.model_dump() for p in result.secondary_passages],
-        }
+        # Pydantic's Rust serializer emits the JSON body in one pass, with no
+        # intermediate dicts for the response layer to re-encode.
+        body = result.model_dump_json()
 
         processing_time = time.time() - start_time
 
-        logger.info(f"SEARCH SUCCESS [{timestamp}]")
-        logger.info(f"   Processing time: {processing_time:.2f}s")
-        logger.info(f"   Found {len(result.passages)} passages, {len(result.secondary_passages)} secondary")
-        logger.info(f"   Passages: {[f'{p.book} {p.chapter}:{p.verse}' if hasattr(p, 'verse') else f'{p.book} {p.start_chapter}:{p.start_verse}-{p.end_verse}' for p in result.passages]}")
+        logger.info(
+            "SEARCH SUCCESS #{search_no} in {secs:.2f}s | {passages} passages, {secondary} secondary",
+            search_no=search_no,
+            secs=processing_time,
+            passages=len(result.passages),
+            secondary=len(result.secondary_passages),
+        )
+        logger.opt(lazy=True).debug("   Passages: {}", lambda: [
+            f"{p.book} {p.chapter}:{p.verse}" if isinstance(p, Verse)
+            else f"{p.book} {p.start_chapter}:{p.start_verse}-{p.end_verse}"
+            for p in result.passages
+        ])
 
-        return JSONResponse(content=response, status_code=200)
+        return Response(content=body, media_type="application/json", status_code=200)
 
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"SEARCH ERROR [{timestamp}]")
-        logger.error(f"   Processing time: {processing_time:.2f}s")
-        logger.error(f"   Error: {str(e)}")
-        logger.error(f"   Error type: {type(e).__name__}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(
+            "SEARCH ERROR after {secs:.2f}s | {error_type}: {error}",
+            secs=processing_time,
+            error_type=type(e).__name__,
+            error=e,
+        )
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/testimonies-categories")
 async def testimonies_categories_endpoint(lang_id: int = 1):
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
 
-    logger.info(f"TESTIMONIES CATEGORIES REQUEST [{timestamp}] lang_id={lang_id}")
+    logger.info(f"TESTIMONIES CATEGORIES REQUEST lang_id={lang_id}")
 
     try:
         tree = get_category_tree(lang_id)
         processing_time = time.time() - start_time
-        logger.info(f"TESTIMONIES CATEGORIES SUCCESS [{timestamp}] {len(tree)} top-level categories in {processing_time:.2f}s")
-        return JSONResponse(content={"categories": tree}, status_code=200)
+        logger.info(f"TESTIMONIES CATEGORIES SUCCESS {len(tree)} top-level categories in {processing_time:.2f}s")
+        return ORJSONResponse(content={"categories": tree}, status_code=200)
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"TESTIMONIES CATEGORIES ERROR [{timestamp}] {str(e)}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(
+            "TESTIMONIES CATEGORIES ERROR after {secs:.2f}s | {error_type}: {error}",
+            secs=processing_time,
+            error_type=type(e).__name__,
+            error=e,
+        )
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/testimonies-suggest")
 async def testimonies_suggest_endpoint(query: str = "", lang: str = "en"):
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
     is_chinese = lang == "zh"
 
-    logger.info(f"TESTIMONIES SUGGEST REQUEST [{timestamp}]")
-    logger.info(f"   Query: '{query}', lang: '{lang}'")
+    logger.info("TESTIMONIES SUGGEST REQUEST query={query!r} lang={lang}", query=query, lang=lang)
 
     try:
         if not query:
-            return JSONResponse(content={"error": "Missing query parameter"}, status_code=400)
+            return ORJSONResponse(content={"error": "Missing query parameter"}, status_code=400)
 
-        user_terms = [t.strip() for t in query.split(",") if t.strip()]
-        query_terms = [
-            {"term": t, "derivatives": [] if is_chinese else generate_derivatives(t)}
-            for t in user_terms
-        ]
+        # Case-insensitive dedupe, keeping the first spelling the user typed.
+        unique_terms: Dict[str, str] = {}
+        for t in query.split(","):
+            t = t.strip()
+            if t:
+                unique_terms.setdefault(t.lower(), t)
+        user_terms = list(unique_terms.values())
+        derivatives = [[] for _ in user_terms] if is_chinese else generate_derivatives_batch(user_terms)
+        query_terms = [{"term": t, "derivatives": d} for t, d in zip(user_terms, derivatives)]
 
-        suggestions = suggest_terms(query, lang=lang)
+        suggestions = await suggest_terms(query, lang=lang)
 
         processing_time = time.time() - start_time
-        logger.info(f"TESTIMONIES SUGGEST SUCCESS [{timestamp}]")
-        logger.info(f"   Processing time: {processing_time:.2f}s")
-        logger.info(f"   Query terms: {[q['term'] for q in query_terms]}")
-        logger.info(f"   Suggested: {[s['term'] for s in suggestions]}")
+        logger.info(
+            "TESTIMONIES SUGGEST SUCCESS in {secs:.2f}s | {count} suggestions",
+            secs=processing_time,
+            count=len(suggestions),
+        )
+        logger.opt(lazy=True).debug(
+            "   Query terms: {} | Suggested: {}",
+            lambda: [q["term"] for q in query_terms],
+            lambda: [s["term"] for s in suggestions],
+        )
 
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "queryTerms": query_terms,
             "suggestions": suggestions,
         }, status_code=200)
 
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"TESTIMONIES SUGGEST ERROR [{timestamp}]")
-        logger.error(f"   Error: {str(e)}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(
+            "TESTIMONIES SUGGEST ERROR after {secs:.2f}s | {error_type}: {error}",
+            secs=processing_time,
+            error_type=type(e).__name__,
+            error=e,
+        )
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/testimonies-analyze")
 async def testimonies_analyze_endpoint(query: str = ""):
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
 
-    logger.info(f"TESTIMONIES ANALYZE REQUEST [{timestamp}]")
-    logger.info(f"   Query: '{query}'")
+    logger.info("TESTIMONIES ANALYZE REQUEST query={query!r}", query=query)
 
     try:
         if not query:
-            return JSONResponse(content={"error": "Missing query parameter"}, status_code=400)
+            return ORJSONResponse(content={"error": "Missing query parameter"}, status_code=400)
 
-        result = analyze_query(query)
+        result = await analyze_query(query)
 
         processing_time = time.time() - start_time
-        logger.info(f"TESTIMONIES ANALYZE SUCCESS [{timestamp}]")
-        logger.info(f"   Processing time: {processing_time:.2f}s")
-        logger.info(f"   Lang IDs: {result['langIds']}")
-        logger.info(f"   EN terms: {[t['term'] for t in result['termsEn']]}")
-        logger.info(f"   ZH terms: {[t['term'] for t in result['termsZh']]}")
+        logger.info(
+            "TESTIMONIES ANALYZE SUCCESS in {secs:.2f}s | langIds={lang_ids}",
+            secs=processing_time,
+            lang_ids=result["langIds"],
+        )
+        logger.opt(lazy=True).debug(
+            "   EN terms: {} | ZH terms: {}",
+            lambda: [t["term"] for t in result["termsEn"]],
+            lambda: [t["term"] for t in result["termsZh"]],
+        )
 
-        return JSONResponse(content=result, status_code=200)
+        return ORJSONResponse(content=result, status_code=200)
 
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"TESTIMONIES ANALYZE ERROR [{timestamp}]")
-        logger.error(f"   Error: {str(e)}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(
+            "TESTIMONIES ANALYZE ERROR after {secs:.2f}s | {error_type}: {error}",
+            secs=processing_time,
+            error_type=type(e).__name__,
+            error=e,
+        )
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/testimonies-search")
@@ -307,21 +413,26 @@ async def testimonies_search_endpoint(
     snippets: bool = False,
 ):
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
 
-    logger.info(f"TESTIMONIES SEARCH REQUEST [{timestamp}]")
-    logger.info(f"   Terms: '{terms}', lang_id: {lang_id}, categories: '{categories}'")
+    logger.info(
+        "TESTIMONIES SEARCH REQUEST terms={terms!r} lang_id={lang_id} categories={categories!r}",
+        terms=terms,
+        lang_id=lang_id,
+        categories=categories,
+    )
 
     try:
         if not terms:
-            return JSONResponse(content={"error": "Missing terms parameter"}, status_code=400)
+            return ORJSONResponse(content={"error": "Missing terms parameter"}, status_code=400)
 
         search_terms = [t.strip() for t in terms.split(",") if t.strip()]
         if not search_terms:
-            return JSONResponse(content={"error": "No valid search terms"}, status_code=400)
+            return ORJSONResponse(content={"error": "No valid search terms"}, status_code=400)
 
         cat_list = [c.strip() for c in categories.split("|") if c.strip()] if categories else None
-        results = search_testimonies_content(
+        # The scan is CPU-bound; run it off the event loop so LLM calls keep flowing.
+        results = await asyncio.to_thread(
+            search_testimonies_content,
             search_terms,
             lang_id=lang_id,
             categories=cat_list,
@@ -335,18 +446,24 @@ async def testimonies_search_endpoint(
 
         processing_time = time.time() - start_time
 
-        logger.info(f"TESTIMONIES SEARCH SUCCESS [{timestamp}]")
-        logger.info(f"   Processing time: {processing_time:.2f}s")
-        logger.info(f"   Search terms ({len(search_terms)}): {search_terms[:10]}{'...' if len(search_terms) > 10 else ''}")
-        logger.info(f"   Found {len(results)} testimonies")
+        logger.info(
+            "TESTIMONIES SEARCH SUCCESS in {secs:.2f}s | {term_count} terms, {count} testimonies",
+            secs=processing_time,
+            term_count=len(search_terms),
+            count=len(results),
+        )
 
-        return JSONResponse(content=response, status_code=200)
+        return ORJSONResponse(content=response, status_code=200)
 
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"TESTIMONIES SEARCH ERROR [{timestamp}]")
-        logger.error(f"   Error: {str(e)}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(
+            "TESTIMONIES SEARCH ERROR after {secs:.2f}s | {error_type}: {error}",
+            secs=processing_time,
+            error_type=type(e).__name__,
+            error=e,
+        )
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/elibrary/trees")
@@ -354,18 +471,18 @@ async def elibrary_trees_endpoint(lang_id: int = 1):
     """Both category trees for the filter UI: legacy (publication-format) and
     taxonomy (LLM topical)."""
     try:
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "legacy": elibrary.get_tree("legacy", lang_id),
             "taxonomy": elibrary.get_tree("taxonomy", lang_id),
         }, status_code=200)
     except Exception as e:
         logger.error(f"ELIBRARY TREES ERROR: {e}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 @app.get("/elibrary/status")
 async def elibrary_status_endpoint():
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "joinMapReady": JMAP is not None,
         "itemCount": len(JMAP.items) if JMAP is not None else 0,
         "semantic": rag_search.status(),
@@ -384,14 +501,14 @@ async def elibrary_search_endpoint(req: ElibrarySearchRequest):
         ], "page": 0, "size": 20}
     """
     start_time = time.time()
-    timestamp = datetime.now().isoformat()
-    logger.info(f"ELIBRARY SEARCH REQUEST [{timestamp}] stages={[s.get('type') for s in req.stages]}")
+    logger.info(f"ELIBRARY SEARCH REQUEST stages={[s.get('type') for s in req.stages]}")
 
     if JMAP is None:
-        return JSONResponse(content={"error": "Index still building, try again shortly"}, status_code=503)
+        return ORJSONResponse(content={"error": "Index still building, try again shortly"}, status_code=503)
 
     try:
-        result = run_pipeline(
+        result = await asyncio.to_thread(
+            run_pipeline,
             JMAP,
             req.stages,
             lang_ids=req.langIds,
@@ -401,17 +518,30 @@ async def elibrary_search_endpoint(req: ElibrarySearchRequest):
         result["semanticReady"] = rag_search.is_ready()
         processing_time = time.time() - start_time
         funnel = " -> ".join(f"{s['inCount']}→{s['outCount']}" for s in result["stages"])
-        logger.info(f"ELIBRARY SEARCH SUCCESS [{timestamp}] {processing_time:.2f}s funnel: {funnel}")
-        return JSONResponse(content=result, status_code=200)
+        logger.info(f"ELIBRARY SEARCH SUCCESS {processing_time:.2f}s funnel: {funnel}")
+        return ORJSONResponse(content=result, status_code=200)
     except Exception as e:
-        logger.error(f"ELIBRARY SEARCH ERROR [{timestamp}] {e}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        logger.error(f"ELIBRARY SEARCH ERROR {e}")
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 
 def main():
     port = int(os.environ.get("PORT", 8080))
-    logger.info(f"[MAIN] Starting uvicorn on 0.0.0.0:{port}")
-    uvicorn.run("app:app", host="0.0.0.0", port=port)
+    # Each worker loads its own copy of the semantic model (~2.3 GB), so stay
+    # at one worker unless the plan has the RAM for more.
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    # Auto-reload is for local development only; uvicorn ignores workers with it.
+    reload = os.environ.get("DEV", "").lower() in ("1", "true", "yes")
+    logger.info(f"[MAIN] Starting uvicorn on 0.0.0.0:{port} ({workers} worker(s), uvloop, reload={reload})")
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=port,
+        workers=None if reload else workers,
+        reload=reload,
+        loop="uvloop",
+        http="httptools",
+    )
 
 
 if __name__ == "__main__":
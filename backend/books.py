@@ -0,0 +1,116 @@
+"""Canonical Bible book names and abbreviation lookup.
+
+The frontend keys its Bible data by the full book names below, so every book
+name returned by the LLM is normalized here rather than trusting the model to
+spell it out. Lookups accept full names, standard abbreviations ("Gen",
+"1 Cor", "Jn") and any unambiguous prefix, ignoring case, dots and spaces, with
+roman or spelled-out ordinals ("II Kings", "First John").
+"""
+from typing import Dict, Optional
+
+BOOK_NAMES = (
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
+    "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel", "1 Kings", "2 Kings",
+    "1 Chronicles", "2 Chronicles", "Ezra", "Nehemiah", "Esther",
+    "Job", "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon",
+    "Isaiah", "Jeremiah", "Lamentations", "Ezekiel", "Daniel",
+    "Hosea", "Joel", "Amos", "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk",
+    "Zephaniah", "Haggai", "Zechariah", "Malachi",
+    "Matthew", "Mark", "Luke", "John", "Acts", "Romans",
+    "1 Corinthians", "2 Corinthians", "Galatians", "Ephesians", "Philippians",
+    "Colossians", "1 Thessalonians", "2 Thessalonians", "1 Timothy", "2 Timothy",
+    "Titus", "Philemon", "Hebrews", "James", "1 Peter", "2 Peter",
+    "1 John", "2 John", "3 John", "Jude", "Revelation",
+)
+
+# Common abbreviations that aren't prefixes of the full name.
+_ABBREVIATIONS = {
+    "Genesis": ("gn",),
+    "Leviticus": ("lv",),
+    "Numbers": ("nm", "nb"),
+    "Deuteronomy": ("dt",),
+    "Judges": ("jdg", "jdgs", "jgs"),
+    "1 Samuel": ("1sm",),
+    "2 Samuel": ("2sm",),
+    "1 Kings": ("1kgs",),
+    "2 Kings": ("2kgs",),
+    "Psalms": ("pss", "psalm"),
+    "Proverbs": ("prv",),
+    "Ecclesiastes": ("qoh", "qoheleth"),
+    "Song of Solomon": ("sos", "sg", "songofsongs", "canticles"),
+    "Ezekiel": ("ezk",),
+    "Zephaniah": ("zep",),
+    "Matthew": ("mt",),
+    "Mark": ("mk", "mrk"),
+    "Luke": ("lk",),
+    "John": ("jn", "jhn"),
+    "Philippians": ("php", "phil"),
+    "1 Thessalonians": ("1ths",),
+    "2 Thessalonians": ("2ths",),
+    "Philemon": ("phm", "phlm"),
+    "James": ("jas", "jm"),
+    "1 Peter": ("1pt",),
+    "2 Peter": ("2pt",),
+    "1 John": ("1jn", "1jhn"),
+    "2 John": ("2jn", "2jhn"),
+    "3 John": ("3jn", "3jhn"),
+    "Revelation": ("rv", "revelations", "apocalypse"),
+}
+
+_ORDINALS = {
+    "i": "1", "1st": "1", "first": "1",
+    "ii": "2", "2nd": "2", "second": "2",
+    "iii": "3", "3rd": "3", "third": "3",
+}
+
+
+def _key(name: str) -> str:
+    parts = name.lower().replace(".", " ").split()
+    if len(parts) > 1 and parts[0] in _ORDINALS:
+        parts[0] = _ORDINALS[parts[0]]
+    return "".join(parts)
+
+
+# Keys of full names and listed abbreviations, which match at any length.
+_EXACT_KEYS = frozenset(
+    [_key(name) for name in BOOK_NAMES]
+    + [alias for aliases in _ABBREVIATIONS.values() for alias in aliases]
+)
+
+
+def _build_lookup() -> Dict[str, str]:
+    full = {_key(name): name for name in BOOK_NAMES}
+    lookup: Dict[str, str] = {}
+    # Every prefix (2+ chars) that identifies exactly one book.
+    for key, name in full.items():
+        for end in range(2, len(key) + 1):
+            prefix = key[:end]
+            if sum(1 for other in full if other.startswith(prefix)) == 1:
+                lookup.setdefault(prefix, name)
+    for name, aliases in _ABBREVIATIONS.items():
+        for alias in aliases:
+            lookup[alias] = name
+    lookup.update(full)
+    return lookup
+
+
+BOOK_CANONICAL: Dict[str, str] = _build_lookup()
+
+
+def canonical_book(name: str) -> str:
+    """Return the canonical book name for ``name``, or ``name`` unchanged if unknown."""
+    return BOOK_CANONICAL.get(_key(name), name)
+
+
+def find_book(name: str, min_prefix: int = 2) -> Optional[str]:
+    """
+    Return the canonical book name for ``name``, or None if it isn't a book.
+
+    Bare prefixes shorter than ``min_prefix`` characters don't match, so
+    callers parsing free text can keep words like "is" or "he" from
+    resolving to a book.
+    """
+    key = _key(name)
+    if len(key) < min_prefix and key not in _EXACT_KEYS:
+        return None
+    return BOOK_CANONICAL.get(key)
@@ -89,16 +89,22 @@ BOOK_MAP = {
 }
 
 
+_SC_TAG_RE = re.compile(r"<SC>(.*?)</SC>")
+_ITALIC_TAG_RE = re.compile(r"<i>(.*?)</i>")
+_ANY_TAG_RE = re.compile(r"<[^>]+>")
+_MULTI_SPACE_RE = re.compile(r"  +")
+
+
 def strip_tags(text: str) -> str:
     """Remove Strong's numbers, SC tags, italic tags, PO tags, and clean up whitespace."""
     # Remove <SC>...</SC> tags but keep inner text
-    text = re.sub(r"<SC>(.*?)</SC>", r"\1", text)
+    text = _SC_TAG_RE.sub(r"\1", text)
     # Remove <i>...</i> tags but keep inner text
-    text = re.sub(r"<i>(.*?)</i>", r"\1", text)
+    text = _ITALIC_TAG_RE.sub(r"\1", text)
     # Remove all remaining tags (Strong's numbers like <WH1234>, <WG5678>, <PO>, etc.)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _ANY_TAG_RE.sub("", text)
     # Collapse multiple spaces into one
-    text = re.sub(r"  +", " ", text)
+    text = _MULTI_SPACE_RE.sub(" ", text)
     return text.strip()
 
 
@@ -0,0 +1,21 @@
+"""Thread-safe counters shared by the API and the search modules."""
+import itertools
+import threading
+
+
+class AtomicCounter:
+    """Monotonic counter that is safe without the GIL (free-threaded CPython)."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def next(self) -> int:
+        with self._lock:
+            self._value = next(self._counter)
+            return self._value
+
+    @property
+    def value(self) -> int:
+        return self._value
@@ -14,11 +14,11 @@ in the slim API process. Content is streamed on demand by the keyword stage.
 """
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
+import orjson
 from loguru import logger
 
 from categories import get_category_tree  # legacy tree
@@ -161,14 +161,13 @@ class JoinMap:
 
 
 def _iter_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
+    # orjson parses the raw bytes (no str decode); blank or malformed lines
+    # simply fail to parse and are skipped.
+    with path.open("rb", buffering=1 << 20) as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
 
 
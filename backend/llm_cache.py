@@ -0,0 +1,117 @@
+"""Persistent SQLite cache for LLM responses.
+
+The in-process TTL caches are lost on every restart and deploy, while the same
+queries keep coming back. This cache stores response JSON on disk keyed by a
+hash of the model, the prompt and the normalized user input, so changing a
+prompt or model naturally misses instead of serving stale answers.
+
+Entries expire after ``ttl`` seconds; once the table grows past
+``max_entries`` the oldest rows are deleted. The database runs in WAL mode so
+concurrent readers (e.g. several uvicorn workers) don't block on writers.
+Async callers use ``aget`` / ``aput``, which run the blocking sqlite calls in a
+worker thread so a busy database never stalls the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from llm_client import CACHE_DIR
+
+DEFAULT_TTL = 30 * 24 * 3600
+# Evict at most once per this many writes; eviction is a full-table query.
+_EVICT_EVERY = 256
+
+
+def cache_key(*parts: str) -> str:
+    """Stable key for the given model / prompt / input strings."""
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, max_entries: int = 50_000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Caller holds self._lock. Opened lazily so importing never touches disk.
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache(created_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value FROM cache WHERE key = ? AND created_at >= ?",
+                    (key, int(time.time() - self.ttl)),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] Persistent cache read failed: {e}")
+            return None
+        return None if row is None else bytes(row[0]).decode("utf-8")
+
+    def put(self, key: str, value: str) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                        (key, value.encode("utf-8"), int(time.time())),
+                    )
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] Persistent cache write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.put, key, value)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Caller holds self._lock.
+        with conn:
+            conn.execute("DELETE FROM cache WHERE created_at < ?", (int(time.time() - self.ttl),))
+            conn.execute(
+                "DELETE FROM cache WHERE rowid NOT IN "
+                "(SELECT rowid FROM cache ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Shared by every LLM-backed endpoint; keys include the model and prompt.
+llm_cache = LLMCache(CACHE_DIR / "responses.sqlite3")
@@ -0,0 +1,110 @@
+"""Shared async OpenAI client for every LLM call in the API process.
+
+One pooled HTTP/2 transport keeps TLS connections warm and lets concurrent
+requests share keep-alive connections instead of queueing behind httpx's
+default pool size.
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, TypeVar
+
+import httpx
+from loguru import logger
+from openai import AsyncOpenAI
+
+# On-disk LLM caches (semantic cache JSONL files).
+CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", Path(__file__).resolve().parent / "llm_cache"))
+
+http_client = httpx.AsyncClient(
+    http2=True,
+    # Idle connections stay open for 5 minutes so bursty traffic skips the TLS handshake.
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=300),
+    timeout=httpx.Timeout(600.0, connect=5.0),  # OpenAI SDK defaults
+)
+client = AsyncOpenAI(http_client=http_client)
+
+# Process-wide cap on in-flight chat completions, sized to the account's rate
+# limit. Acquire it around the request only; never while holding it already.
+OPENAI_SEM = asyncio.Semaphore(int(os.environ.get("OPENAI_CONCURRENCY", "20")))
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Rate limiter that refills ``per_minute`` units evenly over each minute.
+
+    ``acquire`` waits until enough units are available, so bursts up to one
+    minute's budget go straight through and sustained load is smoothed to the
+    limit instead of bouncing off the API's 429s. A non-positive rate disables
+    the bucket. Only used from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self._rate = per_minute / 60.0
+        self._tokens = per_minute
+        self._last = time.monotonic()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        if self.capacity <= 0:
+            return
+        # A single request larger than the whole budget waits for a full bucket.
+        amount = min(amount, self.capacity)
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self._rate)
+
+
+# Per-process request and token budgets, matching the account's RPM/TPM limits
+# divided by the worker count. Unset (0) leaves only OPENAI_SEM in place.
+RPM_BUCKET = TokenBucket(float(os.environ.get("OPENAI_RPM", "0")))
+TPM_BUCKET = TokenBucket(float(os.environ.get("OPENAI_TPM", "0")))
+
+
+def estimate_tokens(messages: List[Dict[str, str]] | str, max_completion_tokens: int = 0) -> int:
+    """
+    Tokens a request counts against TPM: prompt (~4 chars/token) plus the output cap.
+    ``messages`` may also be a plain input string, as for embeddings.
+    """
+    chars = len(messages) if isinstance(messages, str) else sum(len(m["content"]) for m in messages)
+    return chars // 4 + max_completion_tokens
+
+
+async def throttle(tokens: int = 0) -> None:
+    """Wait for room in the RPM and TPM budgets for one request of ``tokens``."""
+    await RPM_BUCKET.acquire()
+    if tokens:
+        await TPM_BUCKET.acquire(tokens)
+
+
+async def limited(coro: Awaitable[T], tokens: int = 0) -> T:
+    """Await an OpenAI request under the rate limits and global concurrency cap."""
+    await throttle(tokens)
+    async with OPENAI_SEM:
+        return await coro
+
+
+async def gather_llm(*coros: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+    """Run OpenAI requests concurrently, at most OPENAI_CONCURRENCY at a time."""
+    return await asyncio.gather(*(limited(c) for c in coros), return_exceptions=return_exceptions)
+
+
+async def warm_client() -> None:
+    """Open a pooled connection to the API before the first user request needs it."""
+    try:
+        await client.models.list()
+        logger.info("[STARTUP] OpenAI connection pool warmed")
+    except Exception as e:
+        logger.warning(f"[STARTUP] OpenAI warm-up failed: {e}")
+
+
+async def close_client() -> None:
+    await http_client.aclose()
@@ -1,5 +1,5 @@
 from typing import List, Union
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Verse(BaseModel):
@@ -11,6 +11,8 @@ class Verse(BaseModel):
         chapter: Chapter number.
         verse: Verse number.
     """
+    model_config = ConfigDict(frozen=True)
+
     book: str
     chapter: int
     verse: int
@@ -27,6 +29,8 @@ class VerseRange(BaseModel):
         end_chapter: Ending chapter number.
         end_verse: Ending verse number.
     """
+    model_config = ConfigDict(frozen=True)
+
     book: str
     start_chapter: int
     start_verse: int
@@ -46,6 +50,16 @@ class PassageQuery(BaseModel):
     secondary_passages: List[Union[Verse, VerseRange]]
 
 
+class PassageQueryBatch(BaseModel):
+    """
+    Results for a batch of numbered queries sent in one request.
+
+    Attributes:
+        results: One PassageQuery per query, in the order the queries were given.
+    """
+    results: List[PassageQuery]
+
+
 class TestimoniesSearchQuery(BaseModel):
     terms: List[str]
 
@@ -15,20 +15,35 @@ in/out counts so the UI can show the tiered funnel.
 """
 from __future__ import annotations
 
-import json
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
 from elibrary import Item, ItemKey, JoinMap, matches_prefixes, parse_item_key
-from testimony_search import generate_derivatives, generate_kwic_preview
-
-BACKEND_DIR = Path(__file__).resolve().parent
-JSONL_BY_LANG = {
-    1: BACKEND_DIR / "testimonies_en.jsonl",
-    2: BACKEND_DIR / "testimonies_zh.jsonl",
-}
+from testimony_search import (
+    TestimonyCorpus,
+    build_term_automaton,
+    count_term_hits,
+    generate_derivatives,
+    generate_kwic_preview,
+    load_testimonies_data,
+)
+
+# item_id -> corpus row, per language, built once per loaded corpus.
+_item_docs: Dict[int, Tuple[TestimonyCorpus, Dict[int, int]]] = {}
+
+
+def _doc_ids_by_item(lang_id: int, corpus: TestimonyCorpus) -> Dict[int, int]:
+    cached = _item_docs.get(lang_id)
+    if cached is not None and cached[0] is corpus:
+        return cached[1]
+    doc_by_item: Dict[int, int] = {}
+    for doc_id, link in enumerate(corpus.links):
+        key = parse_item_key(link)
+        if key is not None and key[0] == lang_id:
+            doc_by_item[key[1]] = doc_id
+    _item_docs[lang_id] = (corpus, doc_by_item)
+    return doc_by_item
 
 
 class StageStat:
@@ -119,6 +134,7 @@ def _run_keyword(state: PipelineState, jmap: JoinMap, params: Dict[str, Any]) ->
         return StageStat("keyword", "keyword (no terms)", in_count, in_count, scored=False)
 
     lowered = [t.lower() for t in terms]
+    automaton = build_term_automaton(lowered)
     want_snippets = bool(params.get("snippets", True))
 
     # Restrict the scan to languages present in the pool.
@@ -128,31 +144,24 @@ def _run_keyword(state: PipelineState, jmap: JoinMap, params: Dict[str, Any]) ->
 
     kept: Set[ItemKey] = set()
     for lid, item_ids in by_lang_pool.items():
-        path = JSONL_BY_LANG.get(lid)
-        if not path or not path.exists():
+        corpus = load_testimonies_data(lid)
+        if not len(corpus):
             continue
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                key = parse_item_key(rec.get("link", ""))
-                if key is None or key[1] not in item_ids or key[0] != lid:
-                    continue
-                full = rec.get("content", "")
-                raw = full.lower()
-                scan = (raw[:5000] + raw[-5000:]) if len(raw) > 10000 else raw
-                hits = sum(scan.count(t) for t in lowered)
-                if hits > 0:
-                    kept.add(key)
-                    state.hit_counts[key] = hits
-                    state.scores[key] = float(hits)
-                    if want_snippets:
-                        state.snippets[key] = generate_kwic_preview(full, lowered)
+        doc_by_item = _doc_ids_by_item(lid, corpus)
+        # Only testimonies the inverted index says can contain a term are scanned.
+        candidates = set(corpus.index.candidates(lowered).tolist()) if corpus.index is not None else None
+        for iid in item_ids:
+            doc_id = doc_by_item.get(iid)
+            if doc_id is None or (candidates is not None and doc_id not in candidates):
+                continue
+            hits = count_term_hits(automaton, corpus.content_lower[doc_id], len(lowered))
+            if hits > 0:
+                key = (lid, iid)
+                kept.add(key)
+                state.hit_counts[key] = hits
+                state.scores[key] = float(hits)
+                if want_snippets:
+                    state.snippets[key] = generate_kwic_preview(corpus.content(doc_id), lowered)
 
     state.pool = kept
     state.order_kind = "keyword"
@@ -10,12 +10,12 @@ restricted to a candidate subset of items via an ``IDSelector``.
 """
 from __future__ import annotations
 
-import json
 import os
 import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+import orjson
 from loguru import logger
 
 from elibrary import ItemKey, parse_item_key
@@ -62,13 +62,13 @@ def _artifact_usable(path: Path, *, kind: str) -> bool:
             return f.read(4) == b"IxFI"
     if kind == "meta":
         try:
-            with path.open("r", encoding="utf-8") as f:
+            with path.open("rb") as f:
                 line = f.readline().strip()
-            if not line or "git-lfs.github.com" in line:
+            if not line or b"git-lfs.github.com" in line:
                 return False
-            json.loads(line)
+            orjson.loads(line)
             return True
-        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        except (OSError, orjson.JSONDecodeError):
             return False
     return False
 
@@ -89,11 +89,17 @@ def _download(url: str, path: Path) -> None:
 
     logger.info(f"[RAG] Downloading {path.name} from {url}")
     path.parent.mkdir(parents=True, exist_ok=True)
-    with requests.get(url, timeout=600, stream=True) as resp:
-        resp.raise_for_status()
-        with path.open("wb") as f:
-            for chunk in resp.iter_content(chunk_size=1 << 20):
-                f.write(chunk)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with requests.get(url, timeout=600, stream=True) as resp:
+            resp.raise_for_status()
+            with tmp.open("wb") as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     logger.info(f"[RAG] Downloaded {path.name} ({path.stat().st_size} bytes)")
 
 
@@ -128,14 +134,13 @@ def _load() -> None:
     item_to_rows: Dict[ItemKey, List[int]] = {}
 
     logger.info(f"[RAG] Reading metadata {meta_path}")
-    with meta_path.open("r", encoding="utf-8") as f:
+    with meta_path.open("rb", buffering=1 << 20) as f:
         for row_idx, line in enumerate(f):
-            line = line.strip()
-            if not line:
+            if line.isspace():
                 rows_key.append(None)
                 rows_text.append("")
                 continue
-            rec = json.loads(line)
+            rec = orjson.loads(line)
             lang_id = int(rec.get("lang_id", 1))
             item_id = rec.get("item_id")
             if item_id is None:
@@ -7,12 +7,17 @@ Data processing pipeline:
 
 import csv
 import json
+import os
 import re
 import sys
 from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 
+import orjson
+
 # Add parent dir to path so we can import categories
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from categories import LEAF_INDEX_EN, LEAF_INDEX_ZH
@@ -25,6 +30,9 @@ JSONL_PATH = BACKEND_DIR / "testimonies.jsonl"
 JSONL_EN_PATH = BACKEND_DIR / "testimonies_en.jsonl"
 JSONL_ZH_PATH = BACKEND_DIR / "testimonies_zh.jsonl"
 
+# Trailing item counts on CSV path segments, e.g. "Testimony (0)".
+_COUNT_SUFFIX_RE = re.compile(r'\s*\(\d+\)$')
+
 
 def extract_link_params(link: str) -> tuple[int | None, int | None]:
     """Extract LangID and ItemID from a testimony link URL."""
@@ -47,6 +55,14 @@ def extract_link_params(link: str) -> tuple[int | None, int | None]:
         return None, None
 
 
+def write_jsonl(path: Path, entries: list[dict]):
+    """Write entries as JSONL through a 1 MB buffered binary handle."""
+    with open(path, "wb", buffering=1 << 20) as f:
+        for entry in entries:
+            f.write(orjson.dumps(entry))
+            f.write(b"\n")
+
+
 # ─── Step 1: CSV category mapping ────────────────────────────────────────────
 
 def map_csv_path_to_tree(csv_path: str, leaf_index: dict[str, list[str]]) -> str | None:
@@ -62,7 +78,7 @@ def map_csv_path_to_tree(csv_path: str, leaf_index: dict[str, list[str]]) -> str
     leaf = segments[-1]
 
     # Strip any trailing counts like " (0)"
-    leaf = re.sub(r'\s*\(\d+\)$', '', leaf).strip()
+    leaf = _COUNT_SUFFIX_RE.sub('', leaf).strip()
 
     matches = leaf_index.get(leaf, [])
     if not matches:
@@ -72,7 +88,7 @@ def map_csv_path_to_tree(csv_path: str, leaf_index: dict[str, list[str]]) -> str
 
     # Ambiguous: use CSV parent segments to disambiguate
     # For each candidate, check if any CSV ancestor appears in the candidate path
-    csv_ancestors = [re.sub(r'\s*\(\d+\)$', '', s).strip() for s in segments[:-1]]
+    csv_ancestors = [_COUNT_SUFFIX_RE.sub('', s).strip() for s in segments[:-1]]
 
     best_match = None
     best_score = -1
@@ -205,14 +221,10 @@ def split_and_update_jsonl(item_categories: dict[int, list[str]]):
 
     # Write out
     print(f"Writing {JSONL_EN_PATH}")
-    with open(JSONL_EN_PATH, "w", encoding="utf-8") as f:
-        for entry in en_entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    write_jsonl(JSONL_EN_PATH, en_entries)
 
     print(f"Writing {JSONL_ZH_PATH}")
-    with open(JSONL_ZH_PATH, "w", encoding="utf-8") as f:
-        for entry in zh_entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    write_jsonl(JSONL_ZH_PATH, zh_entries)
 
     return en_entries, zh_entries
 
@@ -220,16 +232,20 @@ def split_and_update_jsonl(item_categories: dict[int, list[str]]):
 # ─── Step 3: Ingest SRT transcripts ─────────────────────────────────────────
 
 def parse_srt(filepath: Path) -> str:
-    """Parse SRT file, strip timestamps and sequence numbers, return plain text."""
-    lines = []
+    """Parse SRT file, strip timestamps and sequence numbers, return plain text.
+
+    Lines are stripped once here, so the result needs no further stripping.
+    """
     with open(filepath, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            # Skip empty lines, sequence numbers (pure digits), timestamp lines
-            if not line or line.isdigit() or "-->" in line:
-                continue
-            lines.append(line)
-    return " ".join(lines)
+        return " ".join(_iter_srt_text(f))
+
+
+def _iter_srt_text(lines) -> Iterator[str]:
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines, sequence numbers (pure digits), timestamp lines
+        if line and not line.isdigit() and "-->" not in line:
+            yield line
 
 
 def find_srt_files(base_dir: Path) -> list[tuple[int, Path]]:
@@ -245,6 +261,14 @@ def find_srt_files(base_dir: Path) -> list[tuple[int, Path]]:
     return results
 
 
+def parse_srt_files(srts: list[tuple[int, Path]]) -> Iterator[tuple[int, str]]:
+    """Parse SRT files across a process pool, yielding (ItemID, transcript) in input order."""
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        transcripts = ex.map(parse_srt, [path for _, path in srts], chunksize=8)
+        for (item_id, _), transcript in zip(srts, transcripts):
+            yield item_id, transcript
+
+
 def ingest_srt_transcripts(
     en_entries: list[dict],
     zh_entries: list[dict],
@@ -274,14 +298,13 @@ def ingest_srt_transcripts(
     en_new = 0
     en_updated = 0
     en_skipped = 0
-    for item_id, srt_path in en_srts:
-        transcript = parse_srt(srt_path)
-        if not transcript.strip():
+    for item_id, transcript in parse_srt_files(en_srts):
+        if not transcript:
             continue
 
         if item_id in en_by_id:
             existing = en_by_id[item_id]
-            if existing.get("content", "").strip() == transcript.strip():
+            if existing.get("content", "").strip() == transcript:
                 en_skipped += 1
             else:
                 existing["transcript_content"] = transcript
@@ -310,14 +333,13 @@ def ingest_srt_transcripts(
     zh_new = 0
     zh_updated = 0
     zh_skipped = 0
-    for item_id, srt_path in zh_srts:
-        transcript = parse_srt(srt_path)
-        if not transcript.strip():
+    for item_id, transcript in parse_srt_files(zh_srts):
+        if not transcript:
             continue
 
         if item_id in zh_by_id:
             existing = zh_by_id[item_id]
-            if existing.get("content", "").strip() == transcript.strip():
+            if existing.get("content", "").strip() == transcript:
                 zh_skipped += 1
             else:
                 existing["transcript_content"] = transcript
@@ -340,14 +362,10 @@ def ingest_srt_transcripts(
 
     # Rewrite JSONL files with SRT data included
     print(f"\nRewriting {JSONL_EN_PATH} ({len(en_entries)} entries)")
-    with open(JSONL_EN_PATH, "w", encoding="utf-8") as f:
-        for entry in en_entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    write_jsonl(JSONL_EN_PATH, en_entries)
 
     print(f"Rewriting {JSONL_ZH_PATH} ({len(zh_entries)} entries)")
-    with open(JSONL_ZH_PATH, "w", encoding="utf-8") as f:
-        for entry in zh_entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    write_jsonl(JSONL_ZH_PATH, zh_entries)
 
 
 # ─── Main ────────────────────────────────────────────────────────────────────
@@ -0,0 +1,181 @@
+"""Embedding-similarity cache for LLM responses.
+
+Exact-match caching misses paraphrases ("where does esther become queen" vs
+"when did esther become queen") that resolve to the same answer. This cache
+embeds the query with OpenAI's small embedding model and returns a stored
+response when a previous query with the same parameters is close enough in
+cosine similarity.
+
+Embeddings are L2-normalized and kept as one float32 matrix, so a lookup is a
+single matrix-vector product. Entries are appended to a JSONL file and the
+newest ones are reloaded at startup. The file is rewritten down to the live
+entries at load and whenever it reaches twice ``max_entries`` lines. Async
+callers use ``aadd``, which does the file write in a worker thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+import numpy as np
+import orjson
+from loguru import logger
+from openai import AsyncOpenAI
+
+from llm_client import estimate_tokens, limited
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_THRESHOLD = 0.92
+
+
+class SemanticCache:
+    """Cosine-similarity cache over unit-norm query embeddings.
+
+    Rows live in a preallocated matrix that grows by doubling up to
+    ``max_entries`` and is then reused as a ring, so the oldest entry is
+    evicted first (FIFO). Each row records an id for its ``params`` string;
+    a lookup is one matrix-vector product masked to matching params.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        path: Path,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = 10_000,
+    ):
+        self.client = client
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # (capacity, D) float32, unit rows
+        self._param_ids: Optional[np.ndarray] = None  # (capacity,) int32
+        self._param_index: Dict[str, int] = {}
+        self._values: List[Optional[str]] = []
+        self._size = 0
+        self._next = 0
+        self._file_rows = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def load(self) -> int:
+        """Load the newest ``max_entries`` persisted entries. Returns the count."""
+        if not self.path.exists():
+            return 0
+        records: Deque[Dict[str, Any]] = deque(maxlen=self.max_entries)
+        total = 0
+        with self.path.open("rb", buffering=1 << 20) as f:
+            for line in f:
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+                total += 1
+        with self._lock:
+            for rec in records:
+                self._insert(np.asarray(rec["embedding"], dtype=np.float32), rec["params"], rec["value"])
+            self._file_rows = total
+            if total > len(records):
+                self._rewrite(orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE) for rec in records)
+        logger.info(f"[CACHE] Loaded {len(records)} semantic cache entries from {self.path.name}")
+        return len(records)
+
+    async def embed(self, text: str) -> np.ndarray:
+        resp = await limited(
+            self.client.embeddings.create(model=EMBEDDING_MODEL, input=text),
+            tokens=estimate_tokens(text),
+        )
+        vec = np.asarray(resp.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, embedding: np.ndarray, params: str) -> Optional[str]:
+        """Return the cached value of the most similar entry with equal ``params``."""
+        with self._lock:
+            pid = self._param_index.get(params)
+            if pid is None or self._matrix is None:
+                return None
+            scores = self._matrix[:self._size] @ embedding
+            scores[self._param_ids[:self._size] != pid] = -np.inf
+            idx = int(np.argmax(scores))
+            if scores[idx] < self.threshold:
+                return None
+            logger.info(f"[CACHE] Semantic hit (similarity={scores[idx]:.3f})")
+            return self._values[idx]
+
+    def add(self, embedding: np.ndarray, params: str, value: str) -> None:
+        row = embedding.astype(np.float32, copy=False)
+        with self._lock:
+            self._insert(row, params, value)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("ab") as f:
+                    f.write(self._encode(row, params, value))
+                self._file_rows += 1
+            except OSError as e:
+                logger.warning(f"[CACHE] Failed to persist semantic cache entry: {e}")
+                return
+            # Evicted rows stay in the append-only file; drop them once they
+            # outnumber the live ones.
+            if self._file_rows >= 2 * self.max_entries:
+                self._rewrite(self._encoded_rows())
+
+    async def aadd(self, embedding: np.ndarray, params: str, value: str) -> None:
+        await asyncio.to_thread(self.add, embedding, params, value)
+
+    def _insert(self, row: np.ndarray, params: str, value: str) -> None:
+        # Caller holds self._lock.
+        if self._matrix is None:
+            capacity = min(256, self.max_entries)
+            self._matrix = np.zeros((capacity, row.shape[0]), dtype=np.float32)
+            self._param_ids = np.full(capacity, -1, dtype=np.int32)
+            self._values = [None] * capacity
+        elif self._next == len(self._matrix) and self._size < self.max_entries:
+            capacity = min(2 * len(self._matrix), self.max_entries)
+            grow = capacity - len(self._matrix)
+            self._matrix = np.vstack([self._matrix, np.zeros((grow, self._matrix.shape[1]), dtype=np.float32)])
+            self._param_ids = np.concatenate([self._param_ids, np.full(grow, -1, dtype=np.int32)])
+            self._values.extend([None] * grow)
+
+        pid = self._param_index.setdefault(params, len(self._param_index))
+        i = self._next
+        self._matrix[i] = row
+        self._param_ids[i] = pid
+        self._values[i] = value
+        self._next = (i + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+    def _encoded_rows(self) -> Iterable[bytes]:
+        # Caller holds self._lock. Live rows, oldest first.
+        params = {pid: p for p, pid in self._param_index.items()}
+        start = self._next if self._size == self.max_entries else 0
+        for k in range(self._size):
+            i = (start + k) % self.max_entries
+            yield self._encode(self._matrix[i], params[int(self._param_ids[i])], self._values[i])
+
+    def _rewrite(self, lines: Iterable[bytes]) -> None:
+        # Caller holds self._lock.
+        try:
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            rows = 0
+            with tmp.open("wb") as f:
+                for line in lines:
+                    f.write(line)
+                    rows += 1
+            tmp.replace(self.path)
+            self._file_rows = rows
+        except OSError as e:
+            logger.warning(f"[CACHE] Failed to compact {self.path.name}: {e}")
+
+    @staticmethod
+    def _encode(row: np.ndarray, params: str, value: str) -> bytes:
+        # orjson writes the float32 row directly, without a list of Python floats.
+        return orjson.dumps(
+            {"embedding": row, "params": params, "value": value},
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+        )
@@ -0,0 +1,62 @@
+"""Inverted index that narrows keyword search to testimonies that can match.
+
+Testimony search counts raw substring occurrences ("pray" also hits "prayer"),
+so looking terms up as whole words would change results. Instead every
+lowercased word maps to the ids of the testimonies containing it. A query term
+made only of word characters can only occur inside a single word, so the
+testimonies holding any vocabulary word that contains the term are exactly the
+ones worth scanning. Terms with other characters fall back to a full scan, as
+do testimonies whose text doesn't split into short words (e.g. unsegmented
+Chinese), which keeps the vocabulary small.
+"""
+import re
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Testimonies with a longer run of word characters are always scanned.
+MAX_TOKEN_LEN = 24
+
+
+class TestimonyIndex:
+    def __init__(self, texts: Iterable[str]):
+        postings: Dict[str, List[int]] = {}
+        unindexed: List[int] = []
+        size = 0
+        for doc_id, text in enumerate(texts):
+            size += 1
+            tokens = set(_TOKEN_RE.findall(text))
+            if any(len(token) > MAX_TOKEN_LEN for token in tokens):
+                unindexed.append(doc_id)
+                continue
+            for token in tokens:
+                postings.setdefault(token, []).append(doc_id)
+
+        self.size = size
+        self._postings = [np.asarray(ids, dtype=np.int32) for ids in postings.values()]
+        self._unindexed = np.asarray(unindexed, dtype=np.int32)
+        # The vocabulary joined by newlines, so one str.find locates a term in
+        # every word at once; _starts maps a hit back to its word.
+        vocab = list(postings)
+        self._joined = "\n".join(vocab)
+        self._starts = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum([len(token) + 1 for token in vocab], out=self._starts[1:])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def candidates(self, terms: List[str]) -> np.ndarray:
+        """Sorted ids of the testimonies that may contain at least one of ``terms``."""
+        parts = [self._unindexed]
+        for term in terms:
+            if not _TOKEN_RE.fullmatch(term):
+                return np.arange(self.size, dtype=np.int32)
+            pos = self._joined.find(term)
+            while pos != -1:
+                word = int(np.searchsorted(self._starts, pos, side="right")) - 1
+                parts.append(self._postings[word])
+                # Skip the rest of this word; it's already included.
+                pos = self._joined.find(term, int(self._starts[word + 1]))
+        return np.unique(np.concatenate(parts))
@@ -1,21 +1,41 @@
-import json
+import functools
+import mmap
+import multiprocessing
+import os
+import pickle
+import re
 import threading
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 
+import ahocorasick
+import numpy as np
+import orjson
 import requests as http_requests
 from loguru import logger
-from openai import OpenAI
 
+from llm_cache import cache_key, llm_cache
+from llm_client import CACHE_DIR, client, estimate_tokens, limited
 from models import TestimoniesSearchQuery, TestimoniesUnifiedQuery
+from response_cache import TTLCache
+from semantic_cache import SemanticCache
+from testimony_index import TestimonyIndex
 
-client = OpenAI()
+# LLM response caches keyed on the normalized query text, plus paraphrase
+# caches for near-duplicate queries.
+_suggest_cache = TTLCache(maxsize=4096, ttl=3600)
+_analyze_cache = TTLCache(maxsize=4096, ttl=3600)
+_suggest_semantic_cache = SemanticCache(client, CACHE_DIR / "suggest.semantic.jsonl")
+_analyze_semantic_cache = SemanticCache(client, CACHE_DIR / "analyze.semantic.jsonl")
 
 JSONL_PATH_EN = Path(__file__).parent / "testimonies_en.jsonl"
 JSONL_PATH_ZH = Path(__file__).parent / "testimonies_zh.jsonl"
 
-SUFFIXES = ["s", "es", "ed", "d", "ing", "er", "ers", "ly", "tion", "sion", "ment", "ness", "ful", "less", "ous", "ive", "al", "ity"]
+SUFFIXES = ("s", "es", "ed", "d", "ing", "er", "ers", "ly", "tion", "sion", "ment", "ness", "ful", "less", "ous", "ive", "al", "ity")
+_VOWELS = frozenset("aeiou")
+_NO_DOUBLE = frozenset("aeiouwy")
 
 TESTIMONIES_URL_EN = (
     "https://github.com/marko-polo-cheno/bible/raw/main/backend/testimonies_en.jsonl"
@@ -29,27 +49,108 @@ _file_ready_zh = False
 _file_lock = threading.Lock()
 
 
+class TestimonyCorpus:
+    """
+    Parsed testimonies for one language, stored as parallel columns.
+
+    The search loop only reads ``content_lower`` (the lowercased first and last
+    5000 characters of each testimony); the other columns are touched only for
+    testimonies that match. Full content is not kept on the heap: the JSONL is
+    memory-mapped and a record is re-parsed from its byte span on demand.
+    """
+
+    def __init__(self, mm: mmap.mmap | None = None) -> None:
+        self.content_lower: List[str] = []
+        self.previews: List[str] = []
+        self.filenames: List[str] = []
+        self.links: List[str] = []
+        self.categories: List[List[str]] = []
+        self.spans: List[Tuple[int, int]] = []
+        self.index: TestimonyIndex | None = None
+        self._mm = mm
+
+    def __len__(self) -> int:
+        return len(self.content_lower)
+
+    def append(self, testimony: Dict[str, Any], start: int, end: int) -> None:
+        content = testimony.get("content", "")
+        lowered = content.lower()
+        if len(lowered) > 10000:
+            lowered = lowered[:5000] + lowered[-5000:]
+        self.content_lower.append(lowered)
+        self.previews.append(content[:180].rstrip() + ("..." if len(content) > 180 else ""))
+        self.filenames.append(testimony.get("filename", ""))
+        self.links.append(testimony.get("link", ""))
+        self.categories.append(testimony.get("category", []))
+        self.spans.append((start, end))
+
+    def content(self, doc_id: int) -> str:
+        """Full original-case content of a testimony, read back from the mapped file."""
+        start, end = self.spans[doc_id]
+        return orjson.loads(self._mm[start:end]).get("content", "")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The mapping belongs to this process; snapshots are re-attached on load.
+        state = self.__dict__.copy()
+        state["_mm"] = None
+        return state
+
+
+# Parsed testimonies per lang_id, loaded once and kept for the process lifetime.
+_corpus: Dict[int, TestimonyCorpus] = {}
+_corpus_lock = threading.Lock()
+
+# Optional process pool for large keyword scans (TESTIMONY_SCAN_WORKERS, off by
+# default). It is started once, after the corpora load. Workers come from a
+# forkserver (spawn where that is unavailable) instead of forking this
+# multi-threaded process, and each loads the pickled corpus snapshots once.
+SCAN_WORKERS = int(os.environ.get("TESTIMONY_SCAN_WORKERS", "0"))
+_PARALLEL_MIN_DOCS = 2000
+_scan_pool: ProcessPoolExecutor | None = None
+_scan_pool_lock = threading.Lock()
+
+# Bump when the TestimonyCorpus or TestimonyIndex layout changes so stale
+# snapshots are rebuilt instead of unpickled.
+_SNAPSHOT_VERSION = 1
+
+
+# Shared so the EN and ZH downloads reuse one pooled keep-alive connection.
+_http_session = http_requests.Session()
+
+
 def _download_file(url: str, path: Path):
     logger.info(f"Downloading {path.name} from GitHub...")
-    resp = http_requests.get(url, timeout=120, stream=True)
-    resp.raise_for_status()
+    # Write beside the target and rename into place, so an interrupted download
+    # never leaves a truncated file that passes the LFS-pointer check.
+    tmp = path.with_name(path.name + ".tmp")
     size = 0
-    with open(path, "wb") as f:
-        for chunk in resp.iter_content(chunk_size=8192):
-            f.write(chunk)
-            size += len(chunk)
+    try:
+        with _http_session.get(url, timeout=120, stream=True) as resp:
+            resp.raise_for_status()
+            with open(tmp, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+                    size += len(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     logger.info(f"Downloaded {path.name} ({size} bytes)")
 
 
 def _is_lfs_pointer(path: Path) -> bool:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            first_line = f.readline()
-        return "git-lfs.github.com" in first_line
+        with open(path, "rb") as f:
+            first_line = f.readline(200)
+        return b"git-lfs.github.com" in first_line
     except FileNotFoundError:
         return True
 
 
+# Start of a line holding something other than ASCII whitespace.
+_NONBLANK_LINE = re.compile(rb"^[ \t\r\f\v]*\S", re.MULTILINE)
+
+
 def _ensure_file(path: Path, url: str) -> int:
     if _is_lfs_pointer(path):
         logger.warning(f"{path.name} is missing or is a Git LFS pointer")
@@ -59,12 +160,19 @@ def _ensure_file(path: Path, url: str) -> int:
             logger.error(f"Failed to download {path.name}: {e}")
             return 0
 
-    count = 0
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    count += 1
+        # Count non-blank lines a megabyte at a time with one regex scan per
+        # chunk instead of materializing every line. A trailing partial line
+        # is carried into the next chunk so it's counted once.
+        count = 0
+        tail = b""
+        with open(path, "rb", buffering=0) as f:
+            while buf := f.read(1 << 20):
+                buf = tail + buf
+                cut = buf.rfind(b"\n") + 1
+                count += sum(1 for _ in _NONBLANK_LINE.finditer(buf, 0, cut))
+                tail = buf[cut:]
+        count += sum(1 for _ in _NONBLANK_LINE.finditer(tail))
         logger.info(f"{path.name} validated: {count} entries")
     except Exception as e:
         logger.error(f"Failed to validate {path.name}: {e}")
@@ -94,41 +202,139 @@ def ensure_testimonies_file() -> int:
 
 def generate_derivatives(word: str) -> List[str]:
     """Generate common English derivatives of a word (plural, past tense, gerund, etc.)."""
-    word = word.strip().lower()
+    return list(_derivatives(word.strip().lower()))
+
+
+def generate_derivatives_batch(words: List[str]) -> List[List[str]]:
+    """``generate_derivatives`` for every word in ``words``, in order."""
+    derivatives = _derivatives
+    return [list(derivatives(w.strip().lower())) for w in words]
+
+
+@functools.lru_cache(maxsize=10_000)
+def _derivatives(word: str) -> Tuple[str, ...]:
+    # Cached on the normalized word; returns a tuple so callers can't mutate
+    # a shared cache entry.
     if not word or len(word) < 2:
-        return []
+        return ()
 
-    derivatives = set()
-    for suffix in SUFFIXES:
-        derivatives.add(word + suffix)
+    derivatives = [word + suffix for suffix in SUFFIXES]
 
     # Handle words ending in 'e' (e.g., "hope" -> "hoping", "hoped")
     if word.endswith("e"):
-        derivatives.add(word[:-1] + "ing")
-        derivatives.add(word + "d")
-        derivatives.add(word[:-1] + "ation")
+        derivatives.append(word[:-1] + "ing")
+        derivatives.append(word + "d")
+        derivatives.append(word[:-1] + "ation")
 
     # Handle words ending in 'y' (e.g., "pray" -> "prays", "prayed", "praying", "prayer")
     if word.endswith("y"):
-        derivatives.add(word[:-1] + "ies")
-        derivatives.add(word[:-1] + "ied")
-        derivatives.add(word[:-1] + "ier")
+        derivatives.append(word[:-1] + "ies")
+        derivatives.append(word[:-1] + "ied")
+        derivatives.append(word[:-1] + "ier")
 
     # Handle consonant doubling (e.g., "sin" -> "sinning", "sinned")
-    if len(word) >= 3 and word[-1] not in "aeiouwy" and word[-2] in "aeiou" and word[-3] not in "aeiou":
-        derivatives.add(word + word[-1] + "ing")
-        derivatives.add(word + word[-1] + "ed")
-        derivatives.add(word + word[-1] + "er")
+    if len(word) >= 3 and word[-1] not in _NO_DOUBLE and word[-2] in _VOWELS and word[-3] not in _VOWELS:
+        derivatives.append(word + word[-1] + "ing")
+        derivatives.append(word + word[-1] + "ed")
+        derivatives.append(word + word[-1] + "er")
 
-    # Remove the original word if it snuck in
-    derivatives.discard(word)
-    return sorted(derivatives)
+    # Dedupe once at the end, dropping the original word if it snuck in.
+    return tuple(sorted({w for w in derivatives if w != word}))
 
 
 def _get_jsonl_path(lang_id: int) -> Path:
     return JSONL_PATH_ZH if lang_id == 2 else JSONL_PATH_EN
 
 
+def _snapshot_path(path: Path) -> Path:
+    return path.with_name(path.stem + ".index.pkl")
+
+
+def _snapshot_signature(path: Path) -> Tuple[int, int, int]:
+    st = path.stat()
+    return _SNAPSHOT_VERSION, st.st_size, st.st_mtime_ns
+
+
+def _load_snapshot(path: Path) -> TestimonyCorpus | None:
+    """Return the pickled corpus for ``path`` if it was built from the current file."""
+    snapshot = _snapshot_path(path)
+    try:
+        with open(snapshot, "rb") as f:
+            signature, corpus = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable {snapshot.name}: {e}")
+        return None
+    return corpus if signature == _snapshot_signature(path) else None
+
+
+def _save_snapshot(path: Path, corpus: TestimonyCorpus) -> None:
+    snapshot = _snapshot_path(path)
+    tmp = snapshot.with_suffix(".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((_snapshot_signature(path), corpus), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(snapshot)
+    except OSError as e:
+        logger.warning(f"Failed to write {snapshot.name}: {e}")
+
+
+def load_testimonies_data(lang_id: int = 1) -> TestimonyCorpus:
+    """
+    Parse the testimonies JSONL for a language once and keep it in memory.
+
+    Content is lowercased and indexed here, so searches never case-fold or
+    re-read testimonies per request. The parsed columns and index are pickled
+    next to the JSONL (``testimonies_en.index.pkl``) and reused on later starts
+    while the JSONL's size and mtime are unchanged.
+    """
+    corpus = _corpus.get(lang_id)
+    if corpus is not None:
+        return corpus
+
+    with _corpus_lock:
+        if lang_id in _corpus:
+            return _corpus[lang_id]
+
+        path = _get_jsonl_path(lang_id)
+        if _is_lfs_pointer(path):
+            # Not downloaded yet; don't cache an empty corpus.
+            return TestimonyCorpus()
+
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load {path.name}: {e}")
+            return TestimonyCorpus()
+
+        corpus = _load_snapshot(path)
+        if corpus is not None:
+            corpus._mm = mm
+        else:
+            corpus = TestimonyCorpus(mm)
+            start, size = 0, len(mm)
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line = mm[start:end]
+                if line.strip():
+                    try:
+                        corpus.append(orjson.loads(line), start, end)
+                    except orjson.JSONDecodeError:
+                        pass
+                start = end + 1
+
+            corpus.index = TestimonyIndex(corpus.content_lower)
+            _save_snapshot(path, corpus)
+
+        _corpus[lang_id] = corpus
+        logger.info(f"Loaded and indexed {len(corpus)} testimonies from {path.name}")
+        return corpus
+
+
 def generate_kwic_preview(
     content: str,
     terms: List[str],
@@ -140,10 +346,10 @@ def generate_kwic_preview(
         return []
 
     content_lower = content.lower()
+    terms_lower = [term.lower() for term in terms]
     # Find all match positions: (start, end, term_index)
     matches = []
-    for i, term in enumerate(terms):
-        term_lower = term.lower()
+    for i, term_lower in enumerate(terms_lower):
         pos = 0
         while True:
             idx = content_lower.find(term_lower, pos)
@@ -181,9 +387,9 @@ def generate_kwic_preview(
         text = content[win_start:win_end]
         # Find highlights within this window
         highlights = []
-        text_lower = text.lower()
-        for term in terms:
-            term_lower = term.lower()
+        # Slice the already-lowered content rather than lowering each window again.
+        text_lower = content_lower[win_start:win_end]
+        for term_lower in terms_lower:
             pos = 0
             while True:
                 idx = text_lower.find(term_lower, pos)
@@ -213,6 +419,120 @@ def generate_kwic_preview(
     return snippets
 
 
+def build_term_automaton(terms: List[str]) -> "ahocorasick.Automaton":
+    """
+    Aho-Corasick automaton over ``terms`` for ``count_term_hits``.
+
+    Automata are cached per term list, so repeated and paginated searches
+    reuse one; callers must treat the result as read-only.
+    """
+    return _term_automaton(tuple(terms))
+
+
+@functools.lru_cache(maxsize=256)
+def _term_automaton(terms: Tuple[str, ...]) -> "ahocorasick.Automaton":
+    automaton = ahocorasick.Automaton()
+    for i, term in enumerate(terms):
+        automaton.add_word(term, (i, len(term)))
+    automaton.make_automaton()
+    return automaton
+
+
+def count_term_hits(automaton: "ahocorasick.Automaton", text: str, n_terms: int) -> int:
+    """
+    Total occurrences of every term in one pass over ``text``.
+
+    Counts non-overlapping matches per term, so the result equals
+    ``sum(text.count(term) for term in terms)``.
+    """
+    next_start = [0] * n_terms
+    hits = 0
+    for end, (i, length) in automaton.iter(text):
+        start = end - length + 1
+        if start >= next_start[i]:
+            next_start[i] = end + 1
+            hits += 1
+    return hits
+
+
+# Up to this many terms, a substring check (memchr-accelerated str.find) rejects
+# non-matching texts faster than walking them through the automaton; beyond it
+# the repeated passes cost more than they save.
+_PREFILTER_MAX_TERMS = 4
+
+
+def _scan_docs(lang_id: int, terms: List[str], doc_ids: np.ndarray) -> np.ndarray | None:
+    """Hit counts for ``doc_ids``; runs in-process or in a scan worker."""
+    corpus = _corpus.get(lang_id)
+    if corpus is None:
+        return None
+    automaton = build_term_automaton(terms)
+    n_terms = len(terms)
+    content_lower = corpus.content_lower
+    if n_terms > _PREFILTER_MAX_TERMS:
+        counts = (count_term_hits(automaton, content_lower[d], n_terms) for d in doc_ids.tolist())
+    else:
+        counts = (
+            count_term_hits(automaton, text, n_terms) if any(t in text for t in terms) else 0
+            for text in (content_lower[d] for d in doc_ids.tolist())
+        )
+    return np.fromiter(counts, dtype=np.int32, count=len(doc_ids))
+
+
+def _init_scan_worker(lang_ids: Tuple[int, ...]) -> None:
+    """Load the corpus snapshots in a scan worker; languages without one scan in the parent."""
+    for lang_id in lang_ids:
+        corpus = _load_snapshot(_get_jsonl_path(lang_id))
+        if corpus is not None:
+            _corpus[lang_id] = corpus
+
+
+def start_scan_pool() -> None:
+    """Start the scan worker pool once the corpora (and their snapshots) are loaded."""
+    global _scan_pool
+    if SCAN_WORKERS <= 1:
+        return
+    with _scan_pool_lock:
+        if _scan_pool is not None:
+            return
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _scan_pool = ProcessPoolExecutor(
+            max_workers=SCAN_WORKERS,
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_scan_worker,
+            initargs=(tuple(_corpus),),
+        )
+
+
+def shutdown_scan_pool() -> None:
+    global _scan_pool
+    with _scan_pool_lock:
+        pool, _scan_pool = _scan_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _count_hits_parallel(lang_id: int, terms: List[str], doc_ids: np.ndarray) -> np.ndarray:
+    pool = _scan_pool if len(doc_ids) >= _PARALLEL_MIN_DOCS else None
+    if pool is None:
+        return _scan_docs(lang_id, terms, doc_ids)
+    chunks = np.array_split(doc_ids, SCAN_WORKERS)
+    try:
+        futures = [pool.submit(_scan_docs, lang_id, terms, chunk) for chunk in chunks]
+    except RuntimeError:
+        # Shut down (or broken) between the check and the submit.
+        return _scan_docs(lang_id, terms, doc_ids)
+    counts = []
+    for chunk, future in zip(chunks, futures):
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Scan worker failed, scanning in-process: {e}")
+            result = None
+        counts.append(result if result is not None else _scan_docs(lang_id, terms, chunk))
+    return np.concatenate(counts)
+
+
 def search_testimonies_content(
     search_terms: List[str],
     lang_id: int = 1,
@@ -232,50 +552,47 @@ def search_testimonies_content(
     if not unique_terms:
         return []
 
-    jsonl_path = _get_jsonl_path(lang_id)
+    corpus = load_testimonies_data(lang_id)
+    if corpus.index is not None:
+        doc_ids = corpus.index.candidates(unique_terms)
+    else:
+        doc_ids = np.arange(len(corpus), dtype=np.int32)
+
+    doc_categories = corpus.categories
+    if categories:
+        # Category filtering: prefix-based matching
+        doc_ids = np.fromiter(
+            (
+                d for d in doc_ids.tolist()
+                if any(
+                    ec == sc or ec.startswith(sc + "/")
+                    for ec in doc_categories[d]
+                    for sc in categories
+                )
+            ),
+            dtype=np.int32,
+        )
+
+    hits = _count_hits_parallel(lang_id, unique_terms, doc_ids) if len(corpus) else np.zeros(0, dtype=np.int32)
+
+    # Only matching candidates are sorted; the stable descending sort keeps
+    # ties in corpus order.
+    matched = np.flatnonzero(hits)
+    order = matched[np.argsort(-hits[matched], kind="stable")]
     results = []
-    try:
-        with open(jsonl_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    testimony = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                # Category filtering: prefix-based matching
-                if categories:
-                    entry_cats = testimony.get("category", [])
-                    if not any(
-                        ec == sc or ec.startswith(sc + "/")
-                        for ec in entry_cats
-                        for sc in categories
-                    ):
-                        continue
-
-                raw = testimony.get("content", "").lower()
-                content = (raw[:5000] + raw[-5000:]) if len(raw) > 10000 else raw
-                hit_count = sum(content.count(term) for term in unique_terms)
-                if hit_count > 0:
-                    full_content = testimony.get("content", "")
-                    preview = full_content[:180].rstrip() + ("..." if len(full_content) > 180 else "")
-                    entry = {
-                        "filename": testimony.get("filename", ""),
-                        "link": testimony.get("link", ""),
-                        "hitCount": hit_count,
-                        "preview": preview,
-                        "categories": testimony.get("category", []),
-                    }
-                    if generate_snippets:
-                        entry["snippets"] = generate_kwic_preview(full_content, unique_terms)
-                    results.append(entry)
-    except Exception as e:
-        logger.error(f"Error searching testimonies: {e}")
-        return []
+    for j in order.tolist():
+        doc_id = int(doc_ids[j])
+        entry = {
+            "filename": corpus.filenames[doc_id],
+            "link": corpus.links[doc_id],
+            "hitCount": int(hits[j]),
+            "preview": corpus.previews[doc_id],
+            "categories": doc_categories[doc_id],
+        }
+        if generate_snippets:
+            entry["snippets"] = generate_kwic_preview(corpus.content(doc_id), unique_terms)
+        results.append(entry)
 
-    results.sort(key=lambda x: x["hitCount"], reverse=True)
     return results
 
 
@@ -367,25 +684,118 @@ Return a TestimoniesUnifiedQuery object.
 """
 
 
-def analyze_query(user_text: str) -> Dict[str, Any]:
-    """Unified LLM call that auto-detects language, categories, and search terms."""
+def load_caches() -> int:
+    """Load the persisted semantic caches. Called once at startup."""
+    total = 0
+    for cache in (_suggest_semantic_cache, _analyze_semantic_cache):
+        try:
+            total += cache.load()
+        except Exception as e:
+            logger.error(f"Failed to load semantic cache {cache.path.name}: {e}")
+    return total
+
+
+# Bound on reasoning + output tokens for the term-expansion calls, whose answers
+# are a short list of terms.
+_MAX_COMPLETION_TOKENS = 2048
+
+_TERMS_MODEL = "gpt-5.4-mini-2026-03-17"
+
+
+def _normalize_query(user_text: str) -> str:
+    """Cache key for free-text queries: lowercase with whitespace collapsed."""
+    return " ".join(user_text.split()).lower()
+
+
+def _normalize_terms(user_text: str) -> str:
+    """
+    Cache key for comma-separated term lists.
+
+    Order, case, spacing and repeats don't change the suggestions, so
+    "Joy, cancer" and "cancer,joy,JOY" share one entry.
+    """
+    terms = {_normalize_query(t) for t in user_text.replace("，", ",").split(",")}
+    terms.discard("")
+    return ",".join(sorted(terms))
+
+
+async def _cached_llm_json(
+    cache: TTLCache,
+    semantic_cache: SemanticCache,
+    key: Any,
+    disk_key: str,
+    text: str,
+    params: str,
+    call,
+) -> str:
+    """Return the JSON of an LLM result, consulting the exact, persistent and
+    semantic caches in that order.
+
+    ``disk_key`` keys the persistent cache and should cover the model and
+    prompt. ``call`` is a zero-argument coroutine function that performs the
+    LLM call and returns the parsed pydantic model.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    stored = await llm_cache.aget(disk_key)
+    if stored is not None:
+        cache.put(key, stored)
+        return stored
+
+    embedding = None
     try:
-        logger.info(f"Making unified analyze call for: {user_text}")
-        response = client.beta.chat.completions.parse(
-            model="gpt-5.4-mini-2026-03-17",
+        embedding = await semantic_cache.embed(text)
+        similar = semantic_cache.lookup(embedding, params)
+        if similar is not None:
+            cache.put(key, similar)
+            await llm_cache.aput(disk_key, similar)
+            return similar
+    except Exception as e:
+        logger.warning(f"Semantic cache unavailable: {e}")
+
+    payload = (await call()).model_dump_json()
+    cache.put(key, payload)
+    await llm_cache.aput(disk_key, payload)
+    if embedding is not None:
+        await semantic_cache.aadd(embedding, params, payload)
+    return payload
+
+
+async def analyze_query(user_text: str) -> Dict[str, Any]:
+    """Unified LLM call that auto-detects language, categories, and search terms."""
+
+    async def call() -> TestimoniesUnifiedQuery:
+        logger.debug("Making unified analyze call for: {text}", text=user_text)
+        messages = [
+            {"role": "system", "content": _SYSTEM_PROMPT_UNIFIED},
+            {"role": "user", "content": user_text},
+        ]
+        response = await limited(client.beta.chat.completions.parse(
+            model=_TERMS_MODEL,
             reasoning_effort="low",
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT_UNIFIED},
-                {"role": "user", "content": user_text},
-            ],
+            max_completion_tokens=_MAX_COMPLETION_TOKENS,
+            messages=messages,
             response_format=TestimoniesUnifiedQuery,
+        ), tokens=estimate_tokens(messages, _MAX_COMPLETION_TOKENS))
+        logger.debug("Unified analyze call completed successfully")
+        return response.choices[0].message.parsed
+
+    try:
+        key = _normalize_query(user_text)
+        payload = await _cached_llm_json(
+            _analyze_cache, _analyze_semantic_cache,
+            key, cache_key(_TERMS_MODEL, _SYSTEM_PROMPT_UNIFIED, key), user_text, "", call,
         )
-        logger.info("Unified analyze call completed successfully")
-        parsed = response.choices[0].message.parsed
+        parsed = TestimoniesUnifiedQuery.model_validate_json(payload)
 
         # Enrich English terms with derivatives
         terms_en_enriched = sorted(
-            [{"term": t, "derivatives": generate_derivatives(t)} for t in parsed.terms_en],
+            [
+                {"term": t, "derivatives": d}
+                for t, d in zip(parsed.terms_en, generate_derivatives_batch(parsed.terms_en))
+            ],
             key=lambda x: x["term"].lower(),
         )
         terms_zh_enriched = sorted(
@@ -406,32 +816,46 @@ def analyze_query(user_text: str) -> Dict[str, Any]:
         raise
 
 
-def suggest_terms(user_text: str, lang: str = "en") -> List[Dict[str, Any]]:
+def _enrich_terms(raw_terms: List[str], is_chinese: bool) -> List[Dict[str, Any]]:
+    # The model sometimes repeats a term with different casing or spacing;
+    # keep the first spelling so each term is expanded and shown once.
+    seen = set()
+    unique = [t for t in raw_terms if (k := t.strip().lower()) and not (k in seen or seen.add(k))]
+    derivatives = [[] for _ in unique] if is_chinese else generate_derivatives_batch(unique)
+    return sorted(
+        [{"term": t, "derivatives": d} for t, d in zip(unique, derivatives)],
+        key=lambda x: x["term"].lower(),
+    )
+
+
+async def suggest_terms(user_text: str, lang: str = "en") -> List[Dict[str, Any]]:
     system_prompt = _SYSTEM_PROMPT_ZH if lang == "zh" else _SYSTEM_PROMPT_EN
     is_chinese = lang == "zh"
 
-    try:
-        logger.info(f"Making AI suggestion call for: {user_text} (lang={lang})")
-        response = client.beta.chat.completions.parse(
-            model="gpt-5.4-mini-2026-03-17",
+    async def call() -> TestimoniesSearchQuery:
+        logger.debug("Making AI suggestion call for: {text} (lang={lang})", text=user_text, lang=lang)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"I'm searching for: {user_text}"},
+        ]
+        response = await limited(client.beta.chat.completions.parse(
+            model=_TERMS_MODEL,
             reasoning_effort="low",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"I'm searching for: {user_text}"},
-            ],
+            max_completion_tokens=_MAX_COMPLETION_TOKENS,
+            messages=messages,
             response_format=TestimoniesSearchQuery,
-        )
-        logger.info("AI suggestion call completed successfully")
-        raw_terms = response.choices[0].message.parsed.terms
+        ), tokens=estimate_tokens(messages, _MAX_COMPLETION_TOKENS))
+        logger.debug("AI suggestion call completed successfully")
+        return response.choices[0].message.parsed
 
-        enriched = sorted(
-            [
-                {"term": t, "derivatives": [] if is_chinese else generate_derivatives(t)}
-                for t in raw_terms
-            ],
-            key=lambda x: x["term"].lower(),
+    try:
+        terms_key = _normalize_terms(user_text)
+        payload = await _cached_llm_json(
+            _suggest_cache, _suggest_semantic_cache,
+            (lang, terms_key), cache_key(_TERMS_MODEL, system_prompt, terms_key), user_text, lang, call,
         )
-        return enriched
+        return _enrich_terms(TestimoniesSearchQuery.model_validate_json(payload).terms, is_chinese)
     except Exception as e:
         logger.error(f"AI suggestion call failed: {str(e)}")
         raise
+
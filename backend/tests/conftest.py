@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Importing the search modules builds an AsyncOpenAI client and opens caches
+# under LLM_CACHE_DIR; keep both away from real credentials and the repo.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("LLM_CACHE_DIR", tempfile.mkdtemp(prefix="llm_cache_"))
@@ -0,0 +1,46 @@
+import pytest
+
+from books import BOOK_NAMES, canonical_book, find_book
+
+
+@pytest.mark.parametrize("name", BOOK_NAMES)
+def test_full_names_are_canonical(name):
+    assert canonical_book(name) == name
+    assert canonical_book(name.upper()) == name
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Gen", "Genesis"),
+        ("gn", "Genesis"),
+        ("1 Cor", "1 Corinthians"),
+        ("1Cor.", "1 Corinthians"),
+        ("II Kings", "2 Kings"),
+        ("First John", "1 John"),
+        ("Jn", "John"),
+        ("Judg", "Judges"),
+        ("Jude", "Jude"),
+        ("Phil", "Philippians"),
+        ("Phlm", "Philemon"),
+        ("Song of Songs", "Song of Solomon"),
+        ("Rev", "Revelation"),
+    ],
+)
+def test_abbreviations_expand(name, expected):
+    assert canonical_book(name) == expected
+
+
+@pytest.mark.parametrize("name", ["Jud", "Ph", "Jo", "Maccabees"])
+def test_ambiguous_or_unknown_names_pass_through(name):
+    assert canonical_book(name) == name
+    assert find_book(name) is None
+
+
+def test_find_book_min_prefix_rejects_short_bare_prefixes():
+    assert find_book("is") == "Isaiah"
+    assert find_book("is", min_prefix=3) is None
+    assert find_book("he", min_prefix=3) is None
+    # Listed abbreviations match at any length.
+    assert find_book("jn", min_prefix=3) == "John"
+    assert find_book("isa", min_prefix=3) == "Isaiah"
@@ -0,0 +1,49 @@
+import llm_cache
+from llm_cache import LLMCache, cache_key
+
+
+def test_cache_key_depends_on_every_part():
+    assert cache_key("model", "prompt", "q") == cache_key("model", "prompt", "q")
+    assert cache_key("model", "prompt", "q") != cache_key("model", "prompt2", "q")
+    # Parts are delimited, so moving text between them changes the key.
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_round_trip(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite3")
+    cache.put("k", '{"terms": ["祷告", "pray"]}')
+
+    assert cache.get("k") == '{"terms": ["祷告", "pray"]}'
+    assert cache.get("missing") is None
+    cache.close()
+
+    # Persisted across connections.
+    reopened = LLMCache(tmp_path / "cache.sqlite3")
+    assert reopened.get("k") == '{"terms": ["祷告", "pray"]}'
+    reopened.close()
+
+
+async def test_async_round_trip(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite3")
+    await cache.aput("k", "v")
+
+    assert await cache.aget("k") == "v"
+    cache.close()
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite3", ttl=-1)
+    cache.put("k", "v")
+
+    assert cache.get("k") is None
+    cache.close()
+
+
+def test_eviction_keeps_newest_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_EVICT_EVERY", 1)
+    cache = LLMCache(tmp_path / "cache.sqlite3", max_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", f"v{i}")
+
+    assert [cache.get(f"k{i}") for i in range(5)] == [None, None, "v2", "v3", "v4"]
+    cache.close()
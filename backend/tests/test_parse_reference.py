@@ -0,0 +1,42 @@
+import pytest
+
+from bible_search import _parse_reference
+from models import Verse, VerseRange
+
+
+def test_single_verse():
+    result = _parse_reference("John 3:16")
+
+    assert result.passages == [Verse(book="John", chapter=3, verse=16)]
+    assert result.secondary_passages == []
+
+
+def test_ranges_and_multiple_references():
+    result = _parse_reference("1 Cor 13:4-7; Gen 1:1-2:3; jn 1:1")
+
+    assert result.passages == [
+        VerseRange(book="1 Corinthians", start_chapter=13, start_verse=4, end_chapter=13, end_verse=7),
+        VerseRange(book="Genesis", start_chapter=1, start_verse=1, end_chapter=2, end_verse=3),
+        Verse(book="John", chapter=1, verse=1),
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "John 0:0",
+        "John 3:0",
+        "John 0:1",
+        "John 3:16-0",
+        "John 3:16-2:1",
+        "is 1:1",
+        "so 1:1",
+        "he 1:1",
+        "Jud 1:1",
+        "where does esther become queen",
+        "John 3:16; what does it mean",
+        "John 3",
+    ],
+)
+def test_anything_else_is_left_to_the_llm(query):
+    assert _parse_reference(query) is None
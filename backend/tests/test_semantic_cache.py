@@ -0,0 +1,67 @@
+import numpy as np
+
+from semantic_cache import SemanticCache
+
+DIM = 8
+
+
+def _unit(*components: float) -> np.ndarray:
+    vec = np.zeros(DIM, dtype=np.float32)
+    vec[: len(components)] = components
+    return vec / np.linalg.norm(vec)
+
+
+def _cache(tmp_path, **kwargs) -> SemanticCache:
+    return SemanticCache(None, tmp_path / "cache.jsonl", **kwargs)
+
+
+def test_hit_only_above_threshold(tmp_path):
+    cache = _cache(tmp_path, threshold=0.9)
+    cache.add(_unit(1, 0), "few|verses", "stored")
+
+    assert cache.lookup(_unit(1, 0.1), "few|verses") == "stored"  # cos ~0.995
+    assert cache.lookup(_unit(1, 1), "few|verses") is None  # cos ~0.707
+
+
+def test_params_are_isolated(tmp_path):
+    cache = _cache(tmp_path)
+    cache.add(_unit(1, 0), "few|verses", "few")
+    cache.add(_unit(0, 1), "many|verses", "many")
+
+    assert cache.lookup(_unit(1, 0), "few|verses") == "few"
+    assert cache.lookup(_unit(1, 0), "many|verses") is None
+    assert cache.lookup(_unit(1, 0), "unseen") is None
+
+
+def test_returns_most_similar_entry(tmp_path):
+    cache = _cache(tmp_path, threshold=0.5)
+    cache.add(_unit(1, 0.5), "p", "far")
+    cache.add(_unit(1, 0.05), "p", "near")
+
+    assert cache.lookup(_unit(1, 0), "p") == "near"
+
+
+def test_fifo_eviction(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    for i, value in enumerate(["a", "b", "c"]):
+        cache.add(_unit(*([0] * i + [1])), "p", value)
+
+    assert len(cache) == 2
+    assert cache.lookup(_unit(1), "p") is None
+    assert cache.lookup(_unit(0, 0, 1), "p") == "c"
+
+
+async def test_entries_persist_and_file_is_compacted(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = _cache(tmp_path, max_entries=3)
+    for i in range(7):
+        await cache.aadd(_unit(*([0] * i + [1])), "p", f"v{i}")
+
+    # Rewritten to the live entries once it reached twice max_entries lines.
+    assert sum(1 for _ in path.open("rb")) < 2 * 3
+
+    reloaded = _cache(tmp_path, max_entries=3)
+    assert reloaded.load() == 3
+    assert sum(1 for _ in path.open("rb")) == 3
+    assert reloaded.lookup(_unit(*([0] * 6 + [1])), "p") == "v6"
+    assert reloaded.lookup(_unit(*([0] * 3 + [1])), "p") is None
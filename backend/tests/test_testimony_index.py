@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pytest
+
+from testimony_index import MAX_TOKEN_LEN
+from testimony_index import TestimonyIndex as Index  # "Test*" names would be collected
+
+WORDS = ["pray", "prayer", "prayed", "faith", "faithful", "heal", "healing", "water", "baptism", "spirit"]
+
+
+def _substring_scan(texts, terms):
+    """The scan the index replaces: every testimony containing any term."""
+    return [i for i, text in enumerate(texts) if any(term in text for term in terms)]
+
+
+@pytest.fixture(scope="module")
+def texts():
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) for _ in range(300)]
+
+
+@pytest.mark.parametrize(
+    "terms",
+    [["pray"], ["prayer"], ["ray"], ["faith", "heal"], ["ful"], ["tis"], ["missing"], ["pray", "pray"]],
+)
+def test_candidates_match_substring_scan(texts, terms):
+    index = Index(texts)
+
+    assert index.candidates(terms).tolist() == _substring_scan(texts, terms)
+
+
+def test_terms_with_non_word_characters_scan_everything(texts):
+    index = Index(texts)
+
+    assert index.candidates(["holy spirit"]).tolist() == list(range(len(texts)))
+
+
+def test_testimonies_with_long_tokens_are_always_candidates():
+    texts = ["pray", "x" * (MAX_TOKEN_LEN + 1), "water"]
+    index = Index(texts)
+
+    assert len(index) == 3
+    assert index.candidates(["pray"]).tolist() == [0, 1]
+    assert index.candidates(["zzz"]).dtype == np.int32
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from llm_client import TokenBucket, estimate_tokens
+
+
+async def test_burst_up_to_capacity_is_immediate():
+    bucket = TokenBucket(per_minute=60)
+
+    await asyncio.wait_for(bucket.acquire(60), timeout=0.1)
+
+
+async def test_refills_in_proportion_to_elapsed_time():
+    bucket = TokenBucket(per_minute=60)
+    await bucket.acquire(60)
+    # Pretend half a minute has passed: 30 units are back.
+    bucket._last -= 30
+
+    await asyncio.wait_for(bucket.acquire(30), timeout=0.1)
+    assert bucket._tokens < 1
+
+
+async def test_waits_when_empty():
+    bucket = TokenBucket(per_minute=600)  # 10 units/s
+    await bucket.acquire(600)
+
+    start = time.monotonic()
+    await bucket.acquire(1)
+    assert time.monotonic() - start >= 0.05
+
+
+async def test_oversized_request_waits_for_a_full_bucket_only():
+    bucket = TokenBucket(per_minute=60)
+
+    await asyncio.wait_for(bucket.acquire(1_000), timeout=0.1)
+
+
+async def test_non_positive_rate_disables_the_bucket():
+    bucket = TokenBucket(per_minute=0)
+
+    await asyncio.wait_for(bucket.acquire(1_000_000), timeout=0.1)
+
+
+def test_estimate_tokens():
+    messages = [{"role": "system", "content": "x" * 40}, {"role": "user", "content": "y" * 20}]
+
+    assert estimate_tokens(messages, 100) == 115
+    assert estimate_tokens("z" * 40) == 10